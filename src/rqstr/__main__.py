@@ -1,15 +1,22 @@
+import asyncio
 import datetime
-import glob
 import json
 import os
+import sys
+from collections.abc import Iterator
+from functools import cache
 from pathlib import Path
 from cyclopts import App
+import httpx
 from rich import print
+from rich.markup import escape
 
 from loguru import logger
-from rqstr.const import APP_NAME
+from rqstr.const import APP_NAME, HTTP2, HTTP_LIMITS, HTTP_TIMEOUT
 from textwrap import dedent
-from pydantic_settings import BaseSettings
+from typing import Annotated, Literal
+from pydantic import BeforeValidator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from rqstr.schema.request import RequestCollection
 
 app = App(
@@ -21,7 +28,13 @@ app = App(
 class AppConf(BaseSettings):
     """Settings to control how the internals work"""
 
-    ...
+    model_config = SettingsConfigDict(env_prefix="RQSTR_")  # pyright: ignore[reportUnannotatedClassAttribute]
+
+    log_level: Annotated[
+        Literal["TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"],
+        BeforeValidator(str.upper),
+    ] = "INFO"
+    """Level for `restaurant_output.log`, `DEBUG` logs every request and response sent"""
 
 
 @app.command(alias="do")
@@ -32,26 +45,73 @@ async def run(
 ):
     """Scan for request collections in child dirs and run the requests in them."""
     if not input_:
-        glob_str = f"{os.getcwd()}/**/*.rest.yml"
-        print(f"No input files provided, scanning for files in `{glob_str}`")
-        input_ = [Path(p) for p in glob.glob(glob_str, recursive=True)]
-
-    input_ = [p for p in input_ if p.is_file()]
+        root = Path(os.getcwd())
+        print(f"No input files provided, scanning for files in `{root}/**/*.rest.yml`")
+        input_ = list(_find_collection_files(root))
+    else:
+        input_ = [p for p in input_ if p.is_file()]
     print(f"Found {len(input_)} collection files.", end="\n\n")
 
     ns = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S").replace(" ", os.sep)
-    for collection_file in input_:
-        print(f"Loading {collection_file}...", end=" ")
-        rc = RequestCollection.from_yml_file(collection_file)
-        print("Done.")
+    # one client for the whole run so connections are reused between collections
+    async with httpx.AsyncClient(
+        http2=HTTP2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+    ) as client:
+        errors = await asyncio.gather(*(_run_one(f, client, ns) for f in input_))
+
+    # only reported once every collection is done so one bad file doesn't cut the others short
+    failed = [(f, e) for f, e in zip(input_, errors) if e]
+    for collection_file, error in failed:
+        print(f"[red]Failed[/red] {collection_file}: {escape(str(error))}")
+    if failed and fail_on_error:
+        sys.exit(1)
+
+
+def _find_collection_files(root: Path) -> Iterator[Path]:
+    """
+    Walk `root` for `*.rest.yml` files, skipping hidden files and dirs like `glob` does.
+
+    `os.scandir` entries carry the dirent type so this doesn't stat every match again.
+    Symlinked dirs aren't followed, so links back up the tree can't loop.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _find_collection_files(Path(entry.path))
+                elif entry.is_file() and entry.name.endswith(".rest.yml"):
+                    yield Path(entry.path)
+    except OSError:
+        # unreadable or vanished dirs are skipped, as `glob` does
+        logger.warning("Skipping {} while scanning for collections", root)
+
+
+async def _run_one(
+    collection_file: Path, client: httpx.AsyncClient, namespace: str
+) -> Exception | None:
+    """
+    Load and run a single collection, collections run concurrently so only print whole lines.
+
+    Returns the error that stopped the collection rather than raising it, so the others can finish.
+    """
+    try:
+        rc = await RequestCollection.afrom_yml_file(collection_file)
         print(
-            f"[bold]{rc.title}[/bold] - Running {len(rc.requests)} requests...", end=" "
+            f"Loaded {collection_file}, [bold]{rc.title}[/bold] - Running {len(rc.requests)} requests..."
         )
-        responses = await rc.collect()
-        print("Done.")
-        rc.std_output.write(ns, rc, responses)
-        rc.file_output.write(ns, rc, responses)
-        print()
+        responses = await rc.collect(client)
+    except Exception as e:
+        logger.exception("Collection {} failed", collection_file)
+        return e
+
+    # nothing is awaited while writing so a collection's output stays together
+    print(f"[bold]{rc.title}[/bold] - Done.")
+    rc.std_output.write(namespace, rc, responses)
+    rc.file_output.write(namespace, rc, responses)
+    print()
+    return None
 
 
 @app.command
@@ -62,7 +122,14 @@ def gen_schema():
     Use in the yml file to validate the request collection schema:
     `# yaml-language-server: $schema=<pathToTheSchema>/.request_collection_schema.json`
     """
-    print(json.dumps(RequestCollection.model_json_schema()))
+    # straight to stdout, rich would wrap the json to the terminal width
+    _ = sys.stdout.write(f"{_schema_json()}\n")
+
+
+@cache
+def _schema_json() -> str:
+    """Walking the whole model tree for the schema is slow, only do it once"""
+    return json.dumps(RequestCollection.model_json_schema())
 
 
 @app.command
@@ -75,7 +142,7 @@ def example_collection(name: str = "example_collection", include_schema: bool =
     if include_schema:
         schema_file = out_file.parent / ".request_collection_schema.json"
         with open(schema_file, "w") as f:
-            _ = json.dump(RequestCollection.model_json_schema(), f)
+            _ = f.write(_schema_json())
         schema_str = f"# yaml-language-server: $schema={schema_file}"
 
     # make_actual_file
@@ -94,7 +161,10 @@ def example_collection(name: str = "example_collection", include_schema: bool =
 
 
 def main():
+    conf = AppConf()
     logger.remove()
-    _ = logger.add("restaurant_output.log")
+    # filtered by level so debug calls on the request path are dropped before formatting,
+    # and enqueued so file writes happen on loguru's worker thread, not the event loop
+    _ = logger.add("restaurant_output.log", level=conf.log_level, enqueue=True)
 
     app()
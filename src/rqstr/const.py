@@ -1,6 +1,8 @@
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Annotated
 
+import httpx
 from loguru import logger
 from pydantic import BaseModel, Field
 
@@ -15,6 +17,13 @@ if not DEFAULT_OUT_DIR.exists():
 
 RESOURCES_DIR = APP_ROOT / "resources"
 
+HTTP2 = find_spec("h2") is not None
+"""HTTP/2 needs the optional `h2` dependency, `pip install rqstr-cli[http2]`"""
+HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+BENCHMARK_CONCURRENCY = 64
+"""Most sends of one benchmarked request in flight at once"""
+
 
 class GlobalConfig(BaseModel):
     output_dir: Annotated[Path, Field(default_factory=lambda: Path(DEFAULT_OUT_DIR))]
@@ -1,5 +1,6 @@
 from abc import ABCMeta, abstractmethod
-import base64
+from binascii import b2a_base64
+from functools import cached_property
 from typing import override
 from pydantic import BaseModel, SecretStr
 
@@ -14,19 +15,20 @@ class AuthBasic(Auth):
     username: str
     password: SecretStr
 
-    @property
+    @cached_property
     @override
     def header(self):
-        encoded = base64.b64encode(
-            f"{self.username}:{self.password.get_secret_value()}".encode()
-        ).decode()
+        encoded = b2a_base64(
+            f"{self.username}:{self.password.get_secret_value()}".encode(),
+            newline=False,
+        ).decode("ascii")
         return f"Basic {encoded}"
 
 
 class AuthBearerToken(Auth):
     token: str
 
-    @property
+    @cached_property
     @override
     def header(self):
         return f"Bearer {self.token}"
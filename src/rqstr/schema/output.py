@@ -1,7 +1,7 @@
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from collections.abc import Mapping
-from rich import print
+from rich import get_console, print
 from pathlib import Path
 from typing import TYPE_CHECKING, override
 from pydantic import BaseModel, Field
@@ -34,17 +34,22 @@ class StdOutOutput(OutputConf):
         responses: Mapping[str, ResponseCollection],
         include_output: bool = False,
     ):
+        # one print for the lot, each rich print renders and takes the console lock
+        lines: list[str] = []
         for i, (req_name, responses_) in enumerate(responses.items()):
             for j, response in enumerate(responses_.responses):
                 bench_str = (
                     f"{j}/{responses_.benchmark}" if responses_.benchmark else ""
                 )
                 req_name_ = f"{req_name} {bench_str}"
-                print(
+                lines.append(
                     f" [{i + 1}/{len(responses)}] - {req_name_:<20} | {response}"
                 )
                 if include_output:
-                    print(f"  {response.response_text}")
+                    lines.append(f"  {response.response_text}")
+
+        if lines:
+            get_console().print("\n".join(lines), soft_wrap=True)
 
 
 class FileOutput(OutputConf):
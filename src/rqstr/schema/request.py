@@ -1,22 +1,94 @@
 from __future__ import annotations
 import asyncio
-from collections.abc import Sequence
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Sequence
+from functools import cached_property, lru_cache
+import json
+import os
+import re
 from pathlib import Path
-from typing import Annotated, Literal, overload, override
+from threading import Lock
+from typing import Annotated, Any, Literal, overload, override
 import httpx
 from loguru import logger
-from piny import YamlStreamLoader
+import yaml
+from piny import LoadingError, MatcherWithDefaults
 from pydantic import (
     AnyHttpUrl,
     Field,
+    PrivateAttr,
     computed_field,
 )
 
+from rqstr.const import BENCHMARK_CONCURRENCY
 from rqstr.schema.asserts import HasChecks
 from rqstr.schema.auth import HasAuth
 from rqstr.schema.headers import HasHeaders
 from rqstr.schema.output import FileOutput, StdOutOutput
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pyyaml built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+
+class _EnvMatcher(_SafeLoader):
+    """piny's `${VAR:-default}` matcher, but on the libyaml parser when it's available"""
+
+    matcher = MatcherWithDefaults.matcher
+    constructor = staticmethod(MatcherWithDefaults.constructor)
+
+
+# registered once here, piny's loaders add them again on every load which grows the
+# resolver list and races when collections are loaded from several threads
+_EnvMatcher.add_implicit_resolver("!env", _EnvMatcher.matcher, None)
+_EnvMatcher.add_constructor("!env", _EnvMatcher.constructor)
+
+
+_ENV_REF = re.compile(rb"\$\{([a-zA-Z_$0-9]+)")
+
+
+@lru_cache(maxsize=512)
+def _env_refs(path: str, mtime_ns: int) -> tuple[str, ...]:
+    """The env vars a collection file references, their values are filled in while parsing"""
+    names = {m.group(1).decode() for m in _ENV_REF.finditer(Path(path).read_bytes())}
+    return tuple(sorted(names))
+
+
+_CollectionKey = tuple[str, int, tuple[tuple[str, str | None], ...]]
+_COLLECTIONS: OrderedDict[_CollectionKey, RequestCollection] = OrderedDict()
+_COLLECTIONS_LOCK = Lock()
+_COLLECTIONS_MAX = 512
+
+
+def _load_collection(
+    path: str, mtime_ns: int, environ: tuple[tuple[str, str | None], ...]
+) -> RequestCollection:
+    """
+    Parse and validate a collection file, keeping the most recent ones by path, mtime and env.
+
+    Hits return a deep copy so changes to them never reach the cache. A miss skips the copy
+    and hands out the instance it just validated, which is the one that gets cached.
+    """
+    key = (path, mtime_ns, environ)
+    with _COLLECTIONS_LOCK:
+        cached = _COLLECTIONS.get(key)
+        if cached is not None:
+            _COLLECTIONS.move_to_end(key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+
+    try:
+        yml = yaml.load(Path(path).read_bytes(), Loader=_EnvMatcher)  # pyright: ignore [reportAny]
+    except yaml.YAMLError as e:
+        raise LoadingError(origin=e, reason=str(e))
+    collection = RequestCollection.model_validate(yml)
+    with _COLLECTIONS_LOCK:
+        _COLLECTIONS[key] = collection
+        if len(_COLLECTIONS) > _COLLECTIONS_MAX:
+            _ = _COLLECTIONS.popitem(last=False)
+    return collection
+
 
 class RequestData(HasHeaders, HasAuth, HasChecks):
     method: Literal["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS", "TRACE"]
@@ -36,9 +108,24 @@ class RequestData(HasHeaders, HasAuth, HasChecks):
     benchmark: Annotated[int | None, Field(ge=0)] = None
     """The number of times to benchmark the request"""
 
+    _url_str: str = PrivateAttr()
+    """`str(self.url)` normalises the url each time, so it's done once up front"""
+
+    _body_bytes: bytes | None = PrivateAttr(default=None)
+    """The body as json, encoded the same way httpx does for `json=`"""
+
+    @override
+    def model_post_init(self, context: Any, /) -> None:
+        # also runs for `model_construct`, which ResponseCollection relies on
+        self._url_str = str(self.url)
+        if self.body is not None:
+            self._body_bytes = json.dumps(
+                self.body, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+            ).encode()
+
     @override
     def __str__(self):
-        return f"{self.method:<6} {self.to_httpx_request().url}"
+        return f"{self.method:<6} {httpx.URL(self._url_str, params=self.query_params)}"
 
     def to_httpx_request(
         self,
@@ -49,45 +136,84 @@ class RequestData(HasHeaders, HasAuth, HasChecks):
             logger.warning("client is required, making a temp one")
             client = httpx.AsyncClient()
 
-        if not headers:
-            headers = {}
+        # copy so the caller's (often shared) headers aren't mutated
+        headers = dict(headers) if headers else {}
 
         # generate auth header
         if self.auth:
             headers["Authorization"] = self.auth.header
 
+        all_headers = httpx.Headers(self.all_headers(headers))
+        if self._body_bytes is not None:
+            # what `json=` would set, without overriding a user supplied one
+            _ = all_headers.setdefault("Content-Type", "application/json")
+
         return client.build_request(
             method=self.method,
-            url=str(self.url),
-            headers=self.all_headers(headers),
+            url=self._url_str,
+            headers=all_headers,
             params=self.query_params,
-            json=self.body,
+            content=self._body_bytes,
             timeout=self.check.timeout_s or httpx.USE_CLIENT_DEFAULT,
         )
 
-    async def send_with(
+    async def iter_responses(
         self,
         client: httpx.AsyncClient,
         headers: dict[str, str] | None = None,
-    ):
-        """Makes a request and stores the result in the results list"""
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> AsyncIterator[ResponseData]:
+        """
+        Sends the request (`benchmark` times) and yields the responses in the order they arrive.
+
+        At most `BENCHMARK_CONCURRENCY` sends are in flight at once, each one is only started
+        when another finishes. If a semaphore is given every send also holds it while in flight.
+        """
         request = self.to_httpx_request(client, headers)
         logger.debug("Sending request {}", request)
+
+        async def _send():
+            if not semaphore:
+                response = await client.send(request)
+            else:
+                async with semaphore:
+                    response = await client.send(request)
+            logger.debug("Received {} over {}", response, response.http_version)
+            return response
+
         # todo, make async check for setup errors
-        responses = await asyncio.gather(
-            *(client.send(request) for _ in range(self.benchmark or 1))
-        )
-        return ResponseCollection(
-            method=self.method,
-            url=self.url,
-            query_params=self.query_params,
-            body=self.body,
-            benchmark=self.benchmark,
-            headers=self.headers,
-            secret_headers=self.secret_headers,
-            auth=self.auth,
-            check=self.check,
-            responses=[ResponseData(response=r, check=self.check) for r in responses],
+        to_send = self.benchmark or 1
+        in_flight: set[asyncio.Task[httpx.Response]] = set()
+        try:
+            while to_send or in_flight:
+                while to_send and len(in_flight) < BENCHMARK_CONCURRENCY:
+                    in_flight.add(asyncio.create_task(_send()))
+                    to_send -= 1
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    # already validated, skip straight to building the model
+                    yield ResponseData.model_construct(
+                        response=task.result(), check=self.check
+                    )
+        finally:
+            # a failed send or the caller stopping early shouldn't leave sends running
+            for task in in_flight:
+                _ = task.cancel()
+
+    async def send_with(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict[str, str] | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+    ):
+        """Makes a request and stores the result in the results list"""
+        responses = [r async for r in self.iter_responses(client, headers, semaphore)]
+        # every field comes from this already validated setup, don't validate them again
+        return ResponseCollection.model_construct(
+            **{k: getattr(self, k) for k in RequestData.model_fields},
+            responses=responses,
         )
 
 
@@ -101,22 +227,49 @@ class RequestCollection(HasHeaders, HasAuth):
     # todo, make a tree and exe in DAG, use stdlib graphlib
     requests: dict[str, RequestData] = Field(default_factory=dict)
 
-    async def collect(self):
-        """Execute all requests in the collection."""
-        async with httpx.AsyncClient(headers=self.headers) as client:
-            # send each setup with the client and return the result
-            _headers = self.all_headers()
-            requests = {
-                k: await v.send_with(client, headers=_headers)
-                for k, v in self.requests.items()
-            }
+    max_concurrency: Annotated[int | None, Field(ge=1)] = None
+    """
+    Run the requests concurrently, with at most this many in flight at once.
+    By default requests are sent one after another in file order, as later ones may depend on earlier ones.
+    """
 
-        return requests
+    async def collect(self, client: httpx.AsyncClient):
+        """
+        Execute all requests in the collection.
+
+        The client is shared between collections so connections are kept alive across them,
+        collection headers are sent per request rather than set on the client.
+        """
+        # send each setup with the client and return the result
+        _headers = self.all_headers()
+        # snapshot once, the names must line up with the responses after the await
+        names, setups = zip(*self.requests.items()) if self.requests else ((), ())
+        if not self.max_concurrency:
+            responses = [await v.send_with(client, headers=_headers) for v in setups]
+        else:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            responses = await asyncio.gather(
+                *(
+                    v.send_with(client, headers=_headers, semaphore=semaphore)
+                    for v in setups
+                )
+            )
+
+        return dict(zip(names, responses))
 
     @classmethod
     def from_yml_file(cls, file: Path):
-        yml = YamlStreamLoader(stream=file.read_text()).load()  # pyright: ignore [reportUnknownMemberType, reportAny]
-        return RequestCollection.model_validate(yml)
+        """Load a collection, unchanged files are only parsed once per process."""
+        path = str(file.resolve())
+        mtime_ns = file.stat().st_mtime_ns
+        # only the env vars the file uses can change how it loads
+        environ = tuple((k, os.environ.get(k)) for k in _env_refs(path, mtime_ns))
+        return _load_collection(path, mtime_ns, environ)
+
+    @classmethod
+    async def afrom_yml_file(cls, file: Path):
+        """`from_yml_file` in a worker thread so reading and parsing don't block the event loop"""
+        return await asyncio.to_thread(cls.from_yml_file, file)
 
 
 class ResponseCollection(RequestData, Sequence["ResponseData"]):
@@ -142,7 +295,7 @@ class ResponseCollection(RequestData, Sequence["ResponseData"]):
 class ResponseData(HasChecks):
     response: httpx.Response = Field(exclude=True)
     """The httpx.Response that is received"""
-    model_config = {"arbitrary_types_allowed": True}  # pyright: ignore[reportUnannotatedClassAttribute]
+    model_config = {"arbitrary_types_allowed": True, "frozen": True}  # pyright: ignore[reportUnannotatedClassAttribute]
 
     @property
     def httpx_request(self):
@@ -154,8 +307,9 @@ class ResponseData(HasChecks):
         return self.response.status_code
 
     @computed_field
-    @property
+    @cached_property
     def response_text(self) -> str:
+        """Decoding the body isn't free and it's read for both the std and file outputs"""
         return self.response.text
 
     @computed_field
@@ -0,0 +1,94 @@
+import os
+from functools import partial
+from pathlib import Path
+
+import httpx
+import pytest
+
+from rqstr.__main__ import _find_collection_files, run
+
+
+def _collection_files(tmp_path: Path) -> tuple[Path, Path]:
+    valid = tmp_path / "valid.rest.yml"
+    _ = valid.write_text(
+        f"""
+title: valid
+file_output:
+  output_dir: {tmp_path / "out"}
+requests:
+  ping:
+    method: GET
+    url: https://example.com/ping
+"""
+    )
+    invalid = tmp_path / "invalid.rest.yml"
+    _ = invalid.write_text("title: invalid\nrequests:\n  ping:\n    method: NOPE\n")
+    return invalid, valid
+
+
+@pytest.fixture
+def mock_client(monkeypatch: pytest.MonkeyPatch):
+    # a streamed body so the client reads it and sets `elapsed`, which std output prints
+    transport = httpx.MockTransport(
+        lambda _: httpx.Response(204, stream=httpx.ByteStream(b""))
+    )
+    monkeypatch.setattr(
+        httpx, "AsyncClient", partial(httpx.AsyncClient, transport=transport)
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_client")
+async def test__run__invalid_file_does_not_stop_the_others(tmp_path: Path):
+    invalid, valid = _collection_files(tmp_path)
+
+    with pytest.raises(SystemExit) as exit_info:
+        await run([invalid, valid])
+
+    assert exit_info.value.code == 1
+    assert [p.name for p in (tmp_path / "out" / "valid").rglob("*.json")] == [
+        "ping.json"
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_client")
+async def test__run__no_fail_on_error(tmp_path: Path):
+    invalid, valid = _collection_files(tmp_path)
+
+    await run([invalid, valid], fail_on_error=False)
+
+    assert list((tmp_path / "out" / "valid").rglob("ping.json"))
+
+
+def test__find_collection_files__skips_hidden_links_and_unreadable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    for rel in (
+        "a.rest.yml",
+        "sub/b.rest.yml",
+        ".hidden/c.rest.yml",
+        "locked/d.rest.yml",
+    ):
+        (tmp_path / rel).parent.mkdir(exist_ok=True)
+        (tmp_path / rel).touch()
+    (tmp_path / "sub" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    (tmp_path / "locked").chmod(0)
+
+    # root can read a chmod 000 dir, so make scandir refuse it the way it would for a user
+    scandir = os.scandir
+
+    def _scandir(path: Path):
+        if Path(path).name == "locked":
+            raise PermissionError(13, "Permission denied", str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", _scandir)
+    try:
+        found = sorted(
+            p.relative_to(tmp_path) for p in _find_collection_files(tmp_path)
+        )
+    finally:
+        (tmp_path / "locked").chmod(0o755)
+
+    assert found == [Path("a.rest.yml"), Path("sub/b.rest.yml")]
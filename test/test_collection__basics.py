@@ -2,7 +2,13 @@ from conftest import (  # pyright: ignore [reportImplicitRelativeImport]
     RESOURCES_DIR,
 )
 
+import asyncio
+import os
+from pathlib import Path
+
+import httpx
 import pytest
+from pydantic import ValidationError
 
 from rqstr.schema.auth import AuthBasic
 from rqstr.schema.request import RequestCollection
@@ -25,10 +31,165 @@ async def test__request_collection__init_file_secrets(monkeypatch: pytest.Monkey
     http_basic = collection.requests["basic env var"]
     assert isinstance(http_basic.auth, AuthBasic)
     assert http_basic.auth.password.get_secret_value() == pw_value
-    
+
     defaults_not_set = collection.requests["defaults and not set"]
     assert defaults_not_set.query_params
     assert len(defaults_not_set.query_params) == 2
     assert defaults_not_set.query_params["default_val"] == "12"
     assert defaults_not_set.query_params["not_set"] is None
 
+
+def test__request_collection__from_yml_file_cached(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    file = tmp_path / "cached.rest.yml"
+    _ = file.write_text(
+        "title: ${TITLE}\nrequests:\n  one:\n    method: GET\n    url: https://example.com\n"
+    )
+    monkeypatch.setenv("TITLE", "first")
+
+    collection = RequestCollection.from_yml_file(file)
+    assert collection.title == "first"
+    again = RequestCollection.from_yml_file(file)
+    assert again == collection
+    # hits are copies, changing one load doesn't change the next
+    again.requests.clear()
+    assert len(RequestCollection.from_yml_file(file).requests) == 1
+
+    # env vars are substituted while parsing, so a change means a re-parse
+    monkeypatch.setenv("TITLE", "second")
+    assert RequestCollection.from_yml_file(file).title == "second"
+
+    _ = file.write_text(file.read_text().replace("${TITLE}", "edited"))
+    os.utime(file, ns=(0, file.stat().st_mtime_ns + 1))
+    assert RequestCollection.from_yml_file(file).title == "edited"
+
+
+def test__request_collection__from_yml_file_all_errors(tmp_path: Path):
+    file = tmp_path / "invalid.rest.yml"
+    _ = file.write_text(
+        "requests:\n"
+        "  a:\n    method: GOT\n    url: https://example.com\n"
+        "  b:\n    method: GET\n    url: not a url\n"
+    )
+
+    with pytest.raises(ValidationError) as e:
+        _ = RequestCollection.from_yml_file(file)
+    assert [err["loc"] for err in e.value.errors()] == [
+        ("title",),
+        ("requests", "a", "method"),
+        ("requests", "b", "url"),
+    ]
+
+
+def test__request_collection__from_yml_file_merge_key(tmp_path: Path):
+    file = tmp_path / "merge.rest.yml"
+    _ = file.write_text("base: &B\n  title: merged\n<<: *B\n")
+
+    assert RequestCollection.from_yml_file(file).title == "merged"
+
+
+@pytest.mark.asyncio
+async def test__request_collection__afrom_yml_file(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("POSTMAN_PASSWORD", "my_password")
+
+    file = RESOURCES_DIR / "secrets.rest.yml"
+    collection = await RequestCollection.afrom_yml_file(file)
+    assert collection == RequestCollection.from_yml_file(file)
+
+
+@pytest.mark.asyncio
+async def test__request_collection__collect_shared_client():
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200)
+
+    collection = RequestCollection.model_validate(
+        {
+            "title": "Test Collection",
+            "headers": {"X-Collection": "yes"},
+            "requests": {
+                "one": {"method": "GET", "url": "https://example.com/one"},
+                "two": {"method": "GET", "url": "https://example.com/two"},
+            },
+        }
+    )
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        responses = await collection.collect(client)
+        assert not client.is_closed
+
+    assert set(responses) == {"one", "two"}
+    assert len(seen) == 2
+    assert all(r.headers["X-Collection"] == "yes" for r in seen)
+
+
+@pytest.mark.asyncio
+async def test__request_collection__collect_in_file_order():
+    events: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        events.append(f"start {request.url.path}")
+        # the first request is the slowest, it must still finish before the next starts
+        await asyncio.sleep(0.02 if request.url.path == "/create" else 0)
+        events.append(f"end {request.url.path}")
+        return httpx.Response(200)
+
+    collection = RequestCollection.model_validate(
+        {
+            "title": "Test Collection",
+            "requests": {
+                "create": {"method": "POST", "url": "https://example.com/create"},
+                "update": {"method": "PUT", "url": "https://example.com/update"},
+                "delete": {"method": "DELETE", "url": "https://example.com/delete"},
+            },
+        }
+    )
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        responses = await collection.collect(client)
+
+    assert list(responses) == ["create", "update", "delete"]
+    assert events == [
+        f"{step} /{name}"
+        for name in ("create", "update", "delete")
+        for step in ("start", "end")
+    ]
+
+
+@pytest.mark.asyncio
+async def test__request_collection__collect_max_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    collection = RequestCollection.model_validate(
+        {
+            "title": "Test Collection",
+            "max_concurrency": 2,
+            "requests": {
+                "one": {
+                    "method": "GET",
+                    "url": "https://example.com/one",
+                    "benchmark": 4,
+                },
+                "two": {
+                    "method": "GET",
+                    "url": "https://example.com/two",
+                    "benchmark": 4,
+                },
+            },
+        }
+    )
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        responses = await collection.collect(client)
+
+    assert [len(r) for r in responses.values()] == [4, 4]
+    assert peak == 2
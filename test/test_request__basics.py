@@ -1,3 +1,4 @@
+import asyncio
 import http
 import httpx
 import pytest
@@ -27,6 +28,49 @@ async def test__http_setup__init_raw(mock_client: httpx.AsyncClient):
     assert isinstance(req, httpx.Request)
     assert req.method == "GET"
     assert req.url == httpx.URL("https://postman-echo.com/?qp_1=a&qp_1=b&qp_1=c")
+    assert str(setup) == f"GET    {req.url}"
+
+
+@pytest.mark.asyncio
+async def test__http_setup__auth_does_not_leak_into_headers(
+    mock_client: httpx.AsyncClient,
+):
+    shared_headers = {"X-Collection": "yes"}
+    with_auth = RequestData(
+        method="GET",
+        url="https://postman-echo.com/basic-auth",  # pyright: ignore [reportArgumentType]
+        auth=AuthBasic(
+            username="postman",
+            password="password",  # pyright: ignore[reportArgumentType]
+        ),
+    )
+    without_auth = RequestData(
+        method="GET",
+        url="https://postman-echo.com/get",  # pyright: ignore [reportArgumentType]
+    )
+
+    req = with_auth.to_httpx_request(mock_client, shared_headers)
+    assert req.headers["Authorization"] == "Basic cG9zdG1hbjpwYXNzd29yZA=="
+    assert shared_headers == {"X-Collection": "yes"}
+
+    req = without_auth.to_httpx_request(mock_client, shared_headers)
+    assert "Authorization" not in req.headers
+    assert req.headers["X-Collection"] == "yes"
+
+
+@pytest.mark.asyncio
+async def test__http_setup__json_body(mock_client: httpx.AsyncClient):
+    setup = RequestData(
+        method="POST",
+        url="https://postman-echo.com/post",  # pyright: ignore [reportArgumentType]
+        body={"key": "välue"},
+    )
+    req = setup.to_httpx_request(mock_client)
+    expected = mock_client.build_request(
+        "POST", "https://postman-echo.com/post", json={"key": "välue"}
+    )
+    assert req.content == expected.content
+    assert req.headers["Content-Type"] == "application/json"
 
 
 @pytest.mark.asyncio
@@ -80,3 +124,44 @@ async def test__live__http_setup__send_bad_request(live_client: httpx.AsyncClien
 
     with pytest.raises(httpx.ConnectError):
         _ = await setup.send_with(live_client)
+
+
+@pytest.mark.asyncio
+async def test__http_setup__iter_responses_benchmark():
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda _: httpx.Response(204))
+    )
+    setup = RequestData(
+        method="GET",
+        url="https://postman-echo.com/get",  # pyright: ignore [reportArgumentType]
+        benchmark=5,
+    )
+    results = [r async for r in setup.iter_responses(client)]
+    assert len(results) == 5
+    assert all(r.status_code == 204 for r in results)
+
+
+@pytest.mark.asyncio
+async def test__http_setup__iter_responses_benchmark_bounded(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr("rqstr.schema.request.BENCHMARK_CONCURRENCY", 3)
+    in_flight = peak = 0
+
+    async def handler(_: httpx.Request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(204)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    setup = RequestData(
+        method="GET",
+        url="https://postman-echo.com/get",  # pyright: ignore [reportArgumentType]
+        benchmark=10,
+    )
+    results = [r async for r in setup.iter_responses(client)]
+    assert len(results) == 10
+    assert peak == 3